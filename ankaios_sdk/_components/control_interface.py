@@ -51,9 +51,8 @@ __all__ = ["ControlInterface", "ControlInterfaceState"]
 
 import os
 import select
-import time
 import threading
-from typing import Callable
+from typing import Callable, Optional
 from enum import Enum
 from google.protobuf.internal.encoder import _VarintBytes
 from google.protobuf.internal.decoder import _DecodeVarint
@@ -65,6 +64,16 @@ from ..exceptions import ControlInterfaceException, ConnectionClosedException
 from ..utils import DEFAULT_CONTROL_INTERFACE_PATH, get_logger, ANKAIOS_VERSION
 
 
+# The initial hello never changes, so it is serialized only once
+_INITIAL_HELLO_MSG = _control_api.ToAnkaios(
+    hello=_control_api.Hello(
+        protocolVersion=str(ANKAIOS_VERSION)
+    )
+).SerializeToString()
+_INITIAL_HELLO_BYTES = _VarintBytes(len(_INITIAL_HELLO_MSG)) + \
+    _INITIAL_HELLO_MSG
+
+
 class ControlInterfaceState(Enum):
     """ The state of the control interface. """
     INITIALIZED = 1
@@ -98,6 +107,8 @@ class ControlInterface:
     """
     ANKAIOS_CONTROL_INTERFACE_BASE_PATH = "/run/ankaios/control_interface"
     "(str): The base path for the Ankaios control interface."
+    READ_CHUNK_SIZE = 4096
+    "(int): The maximum number of bytes read from the input fifo at once."
 
     def __init__(self,
                  add_response_callback: Callable,
@@ -116,6 +127,9 @@ class ControlInterface:
         self.path = DEFAULT_CONTROL_INTERFACE_PATH
         self._input_file = None
         self._output_file = None
+        # Data read from the input fifo that does not form
+        # a complete message yet
+        self._read_buffer = bytearray()
         # The state of the control interface must not be changed directly.
         # Use the change_state method instead.
         self._state = ControlInterfaceState.TERMINATED
@@ -183,7 +197,10 @@ class ControlInterface:
         """
         Disconnect from the control interface.
         """
-        if not self._state == ControlInterfaceState.INITIALIZED:
+        # While the agent is gone the reading thread is still running
+        # and waits for the agent, so it has to be stopped as well
+        if self._state not in (ControlInterfaceState.INITIALIZED,
+                               ControlInterfaceState.AGENT_DISCONNECTED):
             self._logger.debug("Already disconnected.")
             return
 
@@ -225,7 +242,38 @@ class ControlInterface:
         self._state = state
         self._state_changed_callback(state)
 
-    # pylint: disable=too-many-statements, too-many-branches
+    def _read_messages(self) -> Optional[list[bytes]]:
+        """
+        Reads the data available on the input fifo and splits off the
+        complete length-prefixed messages. Incomplete data is kept
+        until the next read.
+
+        Returns:
+            Optional[list[bytes]]: The complete messages read, None if
+                the fifo returned nothing.
+        """
+        chunk = self._input_file.read(self.READ_CHUNK_SIZE)
+        if not chunk:
+            # The agent is gone, a partial message from it will never
+            # be completed and must not prefix the next agent's data
+            self._read_buffer.clear()
+            return None
+        self._read_buffer += chunk
+
+        messages = []
+        while self._read_buffer:
+            try:
+                # Decode the varint and receive the proto msg length
+                msg_len, pos = _DecodeVarint(self._read_buffer, 0)
+            except IndexError:
+                # The length prefix itself is not complete yet
+                break
+            if len(self._read_buffer) < pos + msg_len:
+                break
+            messages.append(bytes(self._read_buffer[pos:pos + msg_len]))
+            del self._read_buffer[:pos + msg_len]
+        return messages
+
     def _read_from_control_interface(self) -> None:
         """
         Reads from the control interface input fifo.
@@ -236,17 +284,13 @@ class ControlInterface:
             AnkaiosConnectionException: If an error occurs
                 while reading the fifo.
         """
-        # The pragma: no cover is used on small checks that are not expected
-        # to fail. This method is difficult to test and testing each check
-        # would be redundant.
-
-        # pylint: disable=invalid-name
-        MOST_SIGNIFICANT_BIT_MASK = 0b10000000
-
         # pylint: disable=consider-using-with
         try:
+            # Unbuffered, so that no data hides from select in
+            # a buffer of the file object
             self._input_file = open(
-                f"{self.ANKAIOS_CONTROL_INTERFACE_BASE_PATH}/input", "rb"
+                f"{self.ANKAIOS_CONTROL_INTERFACE_BASE_PATH}/input", "rb",
+                buffering=0
             )
         except Exception as e:
             self._logger.error("Error while opening input fifo: %s", e)
@@ -255,6 +299,7 @@ class ControlInterface:
                 "Error while opening input fifo."
             ) from e
         os.set_blocking(self._input_file.fileno(), False)
+        self._read_buffer = bytearray()
 
         try:
             self._logger.info("Started reading from the input pipe.")
@@ -265,19 +310,8 @@ class ControlInterface:
                 if not ready:  # pragma: no cover
                     continue
 
-                # Buffer for reading in the byte size of the proto msg
-                varint_buffer = bytearray()
-                while not self._disconnect_event.is_set():
-                    # Consume byte for byte
-                    next_byte = self._input_file.read(1)
-                    if not next_byte:  # pragma: no cover
-                        break
-                    varint_buffer += next_byte
-                    # Check if we reached the last byte
-                    if next_byte[0] & MOST_SIGNIFICANT_BIT_MASK == 0:
-                        break
-
-                if not varint_buffer:
+                messages = self._read_messages()
+                if messages is None:
                     self.change_state(
                         ControlInterfaceState.AGENT_DISCONNECTED)
                     self._logger.warning(
@@ -285,29 +319,19 @@ class ControlInterface:
                         )
                     self._agent_gone_routine()
                     continue
-                # Decode the varint and receive the proto msg length
-                msg_len, _ = _DecodeVarint(varint_buffer, 0)
-
-                # Buffer for the proto msg itself
-                msg_buf = bytearray()
-                for _ in range(msg_len):
-                    # Read the message according to the length
-                    next_byte = self._input_file.read(1)
-                    if not next_byte:  # pragma: no cover
-                        break
-                    msg_buf += next_byte
-
-                try:
-                    response = Response(bytes(msg_buf))
-                except ResponseException as e:  # pragma: no cover
-                    self._logger.error("Error while reading: %s", e)
-                    continue
-                except ConnectionClosedException as e:  # pragma: no cover
-                    self._logger.error("Connection closed: %s", e)
-                    self.change_state(ControlInterfaceState.CONNECTION_CLOSED)
-                    break
 
-                self._add_response_callback(response)
+                for message in messages:
+                    try:
+                        response = Response(message)
+                    except ResponseException as e:
+                        self._logger.error("Error while reading: %s", e)
+                        continue
+                    except ConnectionClosedException as e:
+                        self._logger.error("Connection closed: %s", e)
+                        self.change_state(
+                            ControlInterfaceState.CONNECTION_CLOSED)
+                        return
+                    self._add_response_callback(response)
         except Exception as e:  # pylint: disable=broad-exception-caught
             self._logger.error("Error while reading fifo file: %s", e)
         finally:
@@ -329,7 +353,9 @@ class ControlInterface:
                 self._logger.warning(
                     "Waiting for the agent.."
                     )
-                time.sleep(AGENT_RECONNECT_INTERVAL)
+                # Wait before the next attempt, unless disconnecting
+                if self._disconnect_event.wait(AGENT_RECONNECT_INTERVAL):
+                    break
             else:
                 self.change_state(ControlInterfaceState.INITIALIZED)
                 break
@@ -342,6 +368,23 @@ class ControlInterface:
         Args:
             to_ankaios (_control_api.ToAnkaios): The ToAnkaios proto message.
 
+        Raises:
+            AnkaiosConnectionException: If the output pipe is None.
+        """
+        # Serialize once and take the length from the result, the upb
+        # backend would otherwise serialize again to compute ByteSize
+        msg = to_ankaios.SerializeToString()
+        # Prefix the proto msg with its byte length
+        self._write_bytes_to_pipe(_VarintBytes(len(msg)) + msg)
+
+    def _write_bytes_to_pipe(self, data: bytes) -> None:
+        """
+        Writes an already length-prefixed message to the control
+        interface output fifo.
+
+        Args:
+            data (bytes): The length-prefixed message.
+
         Raises:
             AnkaiosConnectionException: If the output pipe is None.
         """
@@ -353,10 +396,7 @@ class ControlInterface:
                 "Could not write to pipe, output file handler is None."
             )
 
-        # Adds the byte length of the proto msg
-        self._output_file.write(_VarintBytes(to_ankaios.ByteSize()))
-        # Adds the proto msg itself
-        self._output_file.write(to_ankaios.SerializeToString())
+        self._output_file.write(data)
         self._output_file.flush()
 
     def write_request(self, request: Request) -> None:
@@ -386,11 +426,6 @@ class ControlInterface:
         Raises:
             AnkaiosConnectionException: If an error occurred.
         """
-        initial_hello = _control_api.ToAnkaios(
-            hello=_control_api.Hello(
-                protocolVersion=str(ANKAIOS_VERSION)
-            )
-        )
-        self._write_to_pipe(initial_hello)
+        self._write_bytes_to_pipe(_INITIAL_HELLO_BYTES)
         self._logger.debug("Sent initial hello message with the version %s",
                            ANKAIOS_VERSION)
@@ -53,6 +53,21 @@ import yaml
 from ..exceptions import InvalidManifestException
 from ..utils import WORKLOADS_PREFIX, CONFIGS_PREFIX
 
+# Parse with the libyaml bindings when PyYAML was built with them,
+# the pure python loader produces the same result but is much slower
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader
+
+# The keys a workload of a manifest may have
+_WORKLOAD_ALLOWED_KEYS = frozenset([
+    "runtime", "agent", "restartPolicy", "runtimeConfig",
+    "dependencies", "tags", "controlInterfaceAccess", "configs"
+])
+# The keys a workload of a manifest must have, in the order they are checked
+_WORKLOAD_MANDATORY_KEYS = ("runtime", "runtimeConfig", "agent")
+
 
 class Manifest():
     """
@@ -108,7 +123,9 @@ class Manifest():
             ValueError: If there is an error parsing the YAML string.
         """
         try:
-            return Manifest.from_dict(yaml.safe_load(manifest))
+            return Manifest.from_dict(
+                yaml.load(manifest, Loader=_YamlLoader)
+            )
         except Exception as e:
             raise ValueError(f"Error parsing manifest: {e}") from e
 
@@ -135,19 +152,16 @@ class Manifest():
         if "apiVersion" not in self._manifest.keys():
             raise InvalidManifestException("apiVersion is missing.")
         if "workloads" in self._manifest.keys():
-            wl_allowed_keys = ["runtime", "agent", "restartPolicy",
-                               "runtimeConfig", "dependencies", "tags",
-                               "controlInterfaceAccess", "configs"]
-            wl_mandatory_keys = ["runtime", "runtimeConfig", "agent"]
-            for wl_name in self._manifest["workloads"]:
+            for wl_name, workload in self._manifest["workloads"].items():
                 # Check allowed keys
-                for key in self._manifest["workloads"][wl_name].keys():
-                    if key not in wl_allowed_keys:
-                        raise InvalidManifestException(
-                            f"Invalid key in workload {wl_name}: {key}")
+                if not _WORKLOAD_ALLOWED_KEYS.issuperset(workload):
+                    key = next(key for key in workload
+                               if key not in _WORKLOAD_ALLOWED_KEYS)
+                    raise InvalidManifestException(
+                        f"Invalid key in workload {wl_name}: {key}")
                 # Check mandatory keys
-                for key in wl_mandatory_keys:
-                    if key not in self._manifest["workloads"][wl_name].keys():
+                for key in _WORKLOAD_MANDATORY_KEYS:
+                    if key not in workload:
                         raise InvalidManifestException(
                             f"Mandatory key {key} "
                             f"missing in workload {wl_name}")
@@ -76,6 +76,20 @@ from ..exceptions import WorkloadFieldException, WorkloadBuilderException
 from ..utils import get_logger, WORKLOADS_PREFIX
 
 
+# Lookup tables for the enum fields, built once instead of on every update
+_RESTART_POLICIES = dict(_ank_base.RestartPolicy.items())
+_ADD_CONDITIONS = dict(_ank_base.AddCondition.items())
+_RULE_OPERATIONS = {
+    "Nothing": _ank_base.ReadWriteEnum.RW_NOTHING,
+    "Write": _ank_base.ReadWriteEnum.RW_WRITE,
+    "Read": _ank_base.ReadWriteEnum.RW_READ,
+    "ReadWrite": _ank_base.ReadWriteEnum.RW_READ_WRITE,
+}
+_RULE_OPERATION_NAMES = {
+    value: name for name, value in _RULE_OPERATIONS.items()
+}
+
+
 # pylint: disable=too-many-public-methods
 class Workload:
     """
@@ -180,13 +194,13 @@ class Workload:
         Raises:
             WorkloadFieldException: If an invalid restart policy is provided.
         """
-        if policy not in _ank_base.RestartPolicy.keys():
+        if policy not in _RESTART_POLICIES:
             self.logger.error(
                 "Invalid restart policy provided.")
             raise WorkloadFieldException(
-                "restart policy", policy, _ank_base.RestartPolicy.keys()
+                "restart policy", policy, _RESTART_POLICIES.keys()
             )
-        self._workload.restartPolicy = _ank_base.RestartPolicy.Value(policy)
+        self._workload.restartPolicy = _RESTART_POLICIES[policy]
         self._add_mask(f"{self._main_mask}.restartPolicy")
 
     def get_dependencies(self) -> dict:
@@ -217,15 +231,15 @@ class Workload:
         """
         self._workload.dependencies.dependencies.clear()
         for workload_name, condition in dependencies.items():
-            if condition not in _ank_base.AddCondition.keys():
+            if condition not in _ADD_CONDITIONS:
                 self.logger.error(
                     "Invalid dependency condition provided.")
                 raise WorkloadFieldException(
                     "dependency condition", condition,
-                    _ank_base.AddCondition.keys()
+                    _ADD_CONDITIONS.keys()
                 )
             self._workload.dependencies.dependencies[workload_name] = \
-                _ank_base.AddCondition.Value(condition)
+                _ADD_CONDITIONS[condition]
         self._add_mask(f"{self._main_mask}.dependencies")
 
     def add_tag(self, key: str, value: str) -> None:
@@ -286,21 +300,15 @@ class Workload:
         Raises:
             WorkloadFieldException: If an invalid operation is provided.
         """
-        enum_mapper = {
-            "Nothing": _ank_base.ReadWriteEnum.RW_NOTHING,
-            "Write": _ank_base.ReadWriteEnum.RW_WRITE,
-            "Read": _ank_base.ReadWriteEnum.RW_READ,
-            "ReadWrite": _ank_base.ReadWriteEnum.RW_READ_WRITE,
-        }
-        if operation not in enum_mapper:
+        if operation not in _RULE_OPERATIONS:
             self.logger.error(
                 "Invalid rule operation provided.")
             raise WorkloadFieldException(
-                "rule operation", operation, enum_mapper.keys()
+                "rule operation", operation, _RULE_OPERATIONS.keys()
             )
         return _ank_base.AccessRightsRule(
             stateRule=_ank_base.StateRule(
-                operation=enum_mapper[operation],
+                operation=_RULE_OPERATIONS[operation],
                 filterMasks=filter_masks
             )
         )
@@ -317,14 +325,8 @@ class Workload:
         Returns:
             tuple: A tuple containing operation and filter masks.
         """
-        enum_mapper = {
-            _ank_base.ReadWriteEnum.RW_NOTHING: "Nothing",
-            _ank_base.ReadWriteEnum.RW_WRITE: "Write",
-            _ank_base.ReadWriteEnum.RW_READ: "Read",
-            _ank_base.ReadWriteEnum.RW_READ_WRITE: "ReadWrite",
-        }
         return (
-            enum_mapper[rule.stateRule.operation],
+            _RULE_OPERATION_NAMES[rule.stateRule.operation],
             rule.stateRule.filterMasks
         )
 
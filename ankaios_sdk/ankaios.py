@@ -152,6 +152,7 @@ class Ankaios:
         """
         self._responses_lock = threading.Lock()
         self._responses: dict[str, ResponseEvent] = {}
+        self._timed_out_requests: set[str] = set()
 
         self.logger = get_logger()
         self.set_logger_level(log_level)
@@ -202,6 +203,11 @@ class Ankaios:
         when the state changes.
         """
         self.logger.info("State changed to %s", state)
+        if state != ControlInterfaceState.INITIALIZED:
+            # Requests in flight are never answered by a new agent, so
+            # there is no late response left to drop.
+            with self._responses_lock:
+                self._timed_out_requests.clear()
 
     def _add_response(self, response: Response) -> None:
         """
@@ -212,7 +218,12 @@ class Ankaios:
         self.logger.debug("Received a response with the id %s",
                           request_id)
         with self._responses_lock:
-            if request_id in self._responses:
+            if request_id in self._timed_out_requests:
+                self.logger.warning(
+                    "Dropping response to timed out request %s.",
+                    request_id)
+                self._timed_out_requests.discard(request_id)
+            elif request_id in self._responses:
                 self.logger.debug(
                     "Setting response for existing request.")
                 self._responses[request_id].set_response(response)
@@ -243,10 +254,24 @@ class Ankaios:
             if request_id in self._responses:
                 self.logger.debug("Immediate response available.")
                 return self._responses.pop(request_id).get_response()
-            self._responses[request_id] = ResponseEvent()
+            response_event = ResponseEvent()
+            self._responses[request_id] = response_event
 
         self.logger.debug("Waiting on response.")
-        return self._responses[request_id].wait_for_response(timeout)
+        try:
+            return response_event.wait_for_response(timeout)
+        except TimeoutError:
+            with self._responses_lock:
+                # The response can still arrive later, nobody waits on it
+                # anymore so it has to be dropped when it does.
+                if not response_event.is_set():
+                    self._timed_out_requests.add(request_id)
+            raise
+        finally:
+            # The entry is not needed anymore, whether the response
+            # arrived or the wait timed out.
+            with self._responses_lock:
+                self._responses.pop(request_id, None)
 
     def _send_request(self, request: Request,
                       timeout: float = DEFAULT_TIMEOUT) -> Response:
@@ -806,14 +831,18 @@ class Ankaios:
         Raises:
             TimeoutError: If the state was not reached in time.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        end_time = time.monotonic() + timeout
+        while True:
             workload_state = self.get_execution_state_for_instance_name(
                 instance_name
             )
             if workload_state is not None and workload_state.state == state:
                 return
-            time.sleep(0.1)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            # Poll again later, but never sleep past the deadline
+            time.sleep(min(0.1, remaining))
         raise TimeoutError(
             "Timeout while waiting for workload to reach state."
             )
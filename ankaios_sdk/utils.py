@@ -51,6 +51,8 @@ DEFAULT_CONTROL_INTERFACE_PATH = "/run/ankaios/control_interface"
 
 # Used to sync across different threads when adding handlers
 _logger_lock = threading.Lock()
+# Names of the loggers that already got their handler
+_configured_loggers: set[str] = set()
 
 
 class AnkaiosLogLevel(Enum):
@@ -73,6 +75,9 @@ def get_logger(name="Ankaios logger"):
         name (str): The name of the logger.
     """
     logger = logging.getLogger(name)
+    # Fast path without the lock, every SDK object asks for a logger
+    if name in _configured_loggers:
+        return logger
 
     with _logger_lock:
         if not any(isinstance(handler, logging.StreamHandler)
@@ -83,5 +88,6 @@ def get_logger(name="Ankaios logger"):
             handler = logging.StreamHandler()
             handler.setFormatter(formatter)
             logger.addHandler(handler)
+        _configured_loggers.add(name)
 
     return logger
@@ -120,6 +120,7 @@ setup(
         'dev': [
             'pytest',  # Testing framework
             'pytest-cov',  # Coverage plugin
+            'pytest-xdist',  # Parallel test execution
             'pylint',  # Linter
             'pycodestyle',  # Style guide checker
         ],
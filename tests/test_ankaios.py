@@ -14,16 +14,29 @@
 
 """
 This module contains unit tests for the Ankaios class in the ankaios_sdk.
+
+Fixtures:
+    ankaios: Returns an Ankaios instance with a mocked logger.
+    mock_get_state: Patches Ankaios.get_state for the duration of a test.
+
+Helper Functions:
+    generate_test_ankaios: Helper function to generate an Ankaios instance
+        without connecting to the control interface.
+    patched_send_request: Helper context manager to patch the
+        _send_request method of the Ankaios class.
 """
 
+from contextlib import contextmanager
 from io import StringIO
 import logging
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, call, DEFAULT, Mock, MagicMock, \
+    create_autospec
 import pytest
 from ankaios_sdk import Ankaios, AnkaiosLogLevel, Response, ResponseEvent, \
     UpdateStateSuccess, Manifest, CompleteState, WorkloadInstanceName, \
-    WorkloadStateCollection, WorkloadStateEnum, ControlInterfaceState, \
-    AnkaiosException
+    WorkloadStateCollection, WorkloadStateEnum, ControlInterface, \
+    ControlInterfaceState, AnkaiosException
 from ankaios_sdk.utils import WORKLOADS_PREFIX
 from tests.workload.test_workload import generate_test_workload
 from tests.test_request import generate_test_request
@@ -34,6 +47,21 @@ from tests.workload_state.test_workload_state import \
     generate_test_workload_state
 
 
+MANIFEST = Manifest(MANIFEST_DICT)
+WORKLOAD = generate_test_workload(workload_name="nginx")
+INSTANCE_NAME = WorkloadInstanceName(
+    agent_name="agent_Test",
+    workload_name="workload_Test",
+    workload_id="1234"
+)
+
+RESPONSE_ERROR = Response(MESSAGE_BUFFER_ERROR)
+RESPONSE_COMPLETE_STATE = Response(MESSAGE_BUFFER_COMPLETE_STATE)
+RESPONSE_UPDATE_SUCCESS = Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
+
+SEND_REQUEST_MOCK = create_autospec(Ankaios._send_request)
+
+
 def generate_test_ankaios() -> Ankaios:
     """
     Helper function to generate an Ankaios instance without connecting to the
@@ -42,695 +70,461 @@ def generate_test_ankaios() -> Ankaios:
     Returns:
         Ankaios: The Ankaios instance.
     """
-    with patch("ankaios_sdk.ControlInterface.connect") as mock_connect:
-        ankaios = Ankaios()
+    with patch.object(ControlInterface, "connect") as mock_connect:
+        ankaios_instance = Ankaios()
         mock_connect.assert_called_once()
-    ankaios._control_interface._state = ControlInterfaceState.INITIALIZED
-    return ankaios
+    ankaios_instance._control_interface._state = \
+        ControlInterfaceState.INITIALIZED
+    return ankaios_instance
+
+
+@pytest.fixture
+def ankaios() -> Ankaios:
+    """
+    Fixture that returns an Ankaios instance with a mocked logger.
+
+    Returns:
+        Ankaios: The Ankaios instance.
+    """
+    ankaios_instance = generate_test_ankaios()
+    ankaios_instance.logger = Mock(spec=logging.Logger)
+    return ankaios_instance
+
+
+@pytest.fixture
+def mock_get_state() -> MagicMock:
+    """
+    Fixture that patches Ankaios.get_state for the duration of a test.
+    The mock's return value stands in for the CompleteState, so its
+    getters can be configured and asserted on directly.
+
+    Yields:
+        MagicMock: The get_state mock.
+    """
+    with patch.object(Ankaios, "get_state") as mock:
+        yield mock
+
+
+@contextmanager
+def patched_send_request(return_value=None, side_effect=None):
+    """
+    Helper context manager that patches Ankaios._send_request with the
+    shared autospec mock, reset and configured for the current case.
+
+    Args:
+        return_value (Response): The response to return.
+        side_effect (Exception): The exception to raise instead.
+
+    Yields:
+        MagicMock: The _send_request mock.
+    """
+    SEND_REQUEST_MOCK.reset_mock()
+    SEND_REQUEST_MOCK.return_value = return_value
+    SEND_REQUEST_MOCK.side_effect = side_effect
+    with patch.object(Ankaios, "_send_request", new=SEND_REQUEST_MOCK):
+        yield SEND_REQUEST_MOCK
 
 
 def test_logger():
     """
     Test the logger functionality of the Ankaios class.
     """
-    ankaios = generate_test_ankaios()
-    assert ankaios.logger.level == AnkaiosLogLevel.INFO.value
-    ankaios.set_logger_level(AnkaiosLogLevel.ERROR)
-    assert ankaios.logger.level == AnkaiosLogLevel.ERROR.value
+    ankaios_instance = generate_test_ankaios()
+    assert ankaios_instance.logger.level == AnkaiosLogLevel.INFO.value
+    ankaios_instance.set_logger_level(AnkaiosLogLevel.ERROR)
+    assert ankaios_instance.logger.level == AnkaiosLogLevel.ERROR.value
 
     str_stream = StringIO()
     handler = logging.StreamHandler(str_stream)
-    ankaios.logger.addHandler(handler)
+    ankaios_instance.logger.addHandler(handler)
 
-    ankaios.logger.debug("Debug message")
+    ankaios_instance.logger.debug("Debug message")
     assert str_stream.getvalue() == ""
-    ankaios.logger.error("Error message")
+    ankaios_instance.logger.error("Error message")
     assert "Error message" in str_stream.getvalue()
+    ankaios_instance.logger.removeHandler(handler)
+
+    # A new instance starts again with the default level
+    assert generate_test_ankaios().logger.level == \
+        AnkaiosLogLevel.INFO.value
 
 
 def test_connection():
     """
     Test the connect and disconnect of the Ankaios class.
     """
-    with patch("ankaios_sdk.ControlInterface.connect") as mock_ci_connect, \
-         patch("ankaios_sdk.ControlInterface.disconnect") \
-            as mock_ci_disconnect:
-        with Ankaios() as ankaios:
-            assert isinstance(ankaios, Ankaios)
-            mock_ci_connect.assert_called_once()
-            assert ankaios.logger.level == AnkaiosLogLevel.INFO.value
-        mock_ci_disconnect.assert_called_once()
-
-
-def test_state():
+    with patch.multiple(ControlInterface, connect=DEFAULT,
+                        disconnect=DEFAULT) as mock_ci:
+        with Ankaios() as ankaios_instance:
+            assert isinstance(ankaios_instance, Ankaios)
+            mock_ci["connect"].assert_called_once()
+            assert ankaios_instance.logger.level == AnkaiosLogLevel.INFO.value
+        mock_ci["disconnect"].assert_called_once()
+
+
+@pytest.mark.parametrize("state, keeps_timed_out", [
+    (ControlInterfaceState.INITIALIZED, True),
+    (ControlInterfaceState.TERMINATED, False),
+    (ControlInterfaceState.AGENT_DISCONNECTED, False),
+    (ControlInterfaceState.CONNECTION_CLOSED, False),
+])
+def test_state(
+        ankaios: Ankaios, state: ControlInterfaceState,
+        keeps_timed_out: bool
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the state property of the Ankaios class and the state callback.
+    The timed out requests are forgotten once the connection is lost.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        state (ControlInterfaceState): The new state of the
+            control interface.
+        keeps_timed_out (bool): Whether the timed out requests are kept.
     """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
     assert ankaios.state == ankaios._control_interface._state
-    ankaios._state_changed(ControlInterfaceState.TERMINATED)
+    ankaios._timed_out_requests.add("1234")
+    ankaios._state_changed(state)
     ankaios.logger.info.assert_called_with(
-        "State changed to %s", ControlInterfaceState.TERMINATED
+        "State changed to %s", state
     )
+    assert bool(ankaios._timed_out_requests) == keeps_timed_out
 
 
-def test_add_response():
+@pytest.mark.parametrize("request_first", [False, True],
+                         ids=["response_first", "request_first"])
+def test_add_response(
+        ankaios: Ankaios, request_first: bool
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the _add_response method of the Ankaios class.
     This method is called from the ControlInterface when a response
     is received.
-    """
-    response = Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-
-    # Test response comes first
-    ankaios = generate_test_ankaios()
-    ankaios._add_response(response)
-    assert "1234" in list(ankaios._responses)
-    assert ankaios._responses["1234"].is_set()
 
-    # Test request set first
-    ankaios = generate_test_ankaios()
-    ankaios._responses["1234"] = ResponseEvent()
-    ankaios._add_response(response)
-    assert "1234" in list(ankaios._responses)
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        request_first (bool): Whether the request is already waiting
+            when the response arrives.
+    """
+    if request_first:
+        ankaios._responses["1234"] = ResponseEvent()
+    ankaios._add_response(RESPONSE_UPDATE_SUCCESS)
+    assert "1234" in ankaios._responses
     assert ankaios._responses["1234"].is_set()
+    assert ankaios._responses["1234"].get_response() == \
+        RESPONSE_UPDATE_SUCCESS
 
 
-def test_get_reponse_by_id():
+def test_get_reponse_by_id(
+        ankaios: Ankaios
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the get_response_by_id method of the Ankaios class.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
     """
-    ankaios = generate_test_ankaios()
     assert not ankaios._responses
+
+    def wait_for_response(_timeout):
+        # The request is tracked only while waiting on its response
+        assert ankaios._responses.keys() == {"1234"}
+        assert isinstance(ankaios._responses["1234"], ResponseEvent)
+        return RESPONSE_UPDATE_SUCCESS
+
     with patch("ankaios_sdk.ResponseEvent.wait_for_response") as mock_wait:
-        ankaios._get_response_by_id("1234")
+        mock_wait.side_effect = wait_for_response
+        assert ankaios._get_response_by_id("1234") == \
+            RESPONSE_UPDATE_SUCCESS
         mock_wait.assert_called_once_with(Ankaios.DEFAULT_TIMEOUT)
-        assert list(ankaios._responses.keys()) == ["1234"]
-        assert isinstance(ankaios._responses["1234"], ResponseEvent)
+        assert not ankaios._responses
 
-        response = Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ankaios._responses["1234"] = ResponseEvent(response)
-        assert ankaios._get_response_by_id("1234") == response
-        assert not list(ankaios._responses.keys())
+        mock_wait.side_effect = TimeoutError()
+        with pytest.raises(TimeoutError):
+            ankaios._get_response_by_id("1234")
+        assert not ankaios._responses
+        assert ankaios._timed_out_requests == {"1234"}
+        ankaios._timed_out_requests.clear()
+
+        ankaios._responses["1234"] = ResponseEvent(RESPONSE_UPDATE_SUCCESS)
+        assert ankaios._get_response_by_id("1234") == \
+            RESPONSE_UPDATE_SUCCESS
+        assert not ankaios._responses
 
 
-def test_send_request():
+def test_late_response(
+        ankaios: Ankaios
+        ):  # pylint: disable=redefined-outer-name
     """
-    Test the _send_request method of the Ankaios class.
+    Test that a response arriving after its request timed out is
+    dropped instead of being kept as an early response.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+    """
+    with pytest.raises(TimeoutError):
+        ankaios._get_response_by_id("1234", timeout=0)
+    assert not ankaios._responses
+    assert ankaios._timed_out_requests == {"1234"}
+
+    ankaios._add_response(RESPONSE_UPDATE_SUCCESS)
+    assert not ankaios._responses
+    assert not ankaios._timed_out_requests
+    ankaios.logger.warning.assert_called_once()
+
+
+def test_send_request(
+        ankaios: Ankaios
+        ):  # pylint: disable=redefined-outer-name
     """
-    ankaios = generate_test_ankaios()
+    Test the _send_request method of the Ankaios class.
 
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+    """
     request = generate_test_request()
     with patch("ankaios_sdk.ControlInterface.write_request") as mock_write, \
             patch("ankaios_sdk.Ankaios._get_response_by_id") \
             as mock_get_response:
+        # Test success
         ankaios._send_request(request)
         mock_write.assert_called_once_with(request)
         mock_get_response.assert_called_once_with(
             request.get_id(), Ankaios.DEFAULT_TIMEOUT
         )
 
-    with patch("ankaios_sdk.ControlInterface.write_request") as mock_write, \
-            patch("ankaios_sdk.Ankaios._get_response_by_id") \
-            as mock_get_response:
+        # Test timeout
+        mock_write.reset_mock()
         mock_get_response.side_effect = TimeoutError()
         with pytest.raises(TimeoutError):
             ankaios._send_request(request)
         mock_write.assert_called_once_with(request)
 
 
-def test_apply_manifest():
-    """
-    Test the apply manifest method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-    manifest = Manifest(MANIFEST_DICT)
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ret = ankaios.apply_manifest(manifest)
-        assert isinstance(ret, UpdateStateSuccess)
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.apply_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.apply_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.apply_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_delete_manifest():
-    """
-    Test the delete manifest method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-    manifest = Manifest(MANIFEST_DICT)
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ret = ankaios.delete_manifest(manifest)
-        assert isinstance(ret, UpdateStateSuccess)
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.delete_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_manifest(manifest)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_apply_workload():
-    """
-    Test the apply workload method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-    workload = generate_test_workload()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ret = ankaios.apply_workload(workload)
-        assert isinstance(ret, UpdateStateSuccess)
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.apply_workload(workload)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.apply_workload(workload)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.apply_workload(workload)
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_get_workload():
+@pytest.mark.parametrize("method, args, return_type", [
+    ("apply_manifest", (MANIFEST,), UpdateStateSuccess),
+    ("delete_manifest", (MANIFEST,), UpdateStateSuccess),
+    ("apply_workload", (WORKLOAD,), UpdateStateSuccess),
+    ("delete_workload", ("nginx",), UpdateStateSuccess),
+    ("update_configs", ({"name": "config"},), type(None)),
+    ("add_config", ("name", "config"), type(None)),
+    ("delete_all_configs", (), type(None)),
+    ("delete_config", ("config_name",), type(None)),
+])
+@pytest.mark.parametrize(
+    "response, side_effect, expected_exception, expected_log", [
+        (RESPONSE_UPDATE_SUCCESS, None, None, "info"),
+        (RESPONSE_ERROR, None, AnkaiosException, "error"),
+        (None, TimeoutError, TimeoutError, "error"),
+        (RESPONSE_COMPLETE_STATE, None, AnkaiosException, None),
+    ], ids=["success", "error", "timeout", "invalid_content_type"])
+def test_update_state_methods(  # pylint: disable=too-many-arguments
+        ankaios: Ankaios,  # pylint: disable=redefined-outer-name
+        method: str, args: tuple, return_type: type, response: Response,
+        side_effect: type, expected_exception: type, expected_log: str
+        ):  # pylint: disable=too-many-positional-arguments
+    """
+    Test the Ankaios methods that update the state, from manifests
+    and workloads to configs.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        method (str): The name of the Ankaios method to call.
+        args (tuple): The arguments to pass to the method.
+        return_type (type): The type returned on success.
+        response (Response): The response returned by _send_request.
+        side_effect (type): The exception raised by _send_request.
+        expected_exception (type): The exception the method should raise,
+            None if it should succeed.
+        expected_log (str): The logger method expected to be called,
+            None if nothing should be logged.
+    """
+    with patched_send_request(response, side_effect) as mock_send_request:
+        if expected_exception is None:
+            ret = getattr(ankaios, method)(*args)
+            assert isinstance(ret, return_type)
+        else:
+            with pytest.raises(expected_exception):
+                getattr(ankaios, method)(*args)
+        mock_send_request.assert_called_once()
+    if expected_log is not None:
+        getattr(ankaios.logger, expected_log).assert_called_once()
+
+
+def test_get_workload(
+        ankaios: Ankaios, mock_get_state: MagicMock
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the get workload of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    workload_name = "nginx"
-    workload = generate_test_workload(
-        workload_name=workload_name
-    )
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workloads") \
-            as mock_state_get_workloads:
-        mock_get_state.return_value = CompleteState()
-        mock_state_get_workloads.return_value = [workload]
-        ret = ankaios.get_workload(workload_name)
-        assert ret == workload
-        mock_get_state.assert_called_once_with(
-            Ankaios.DEFAULT_TIMEOUT,
-            [f"{WORKLOADS_PREFIX}.nginx"]
-        )
-        mock_state_get_workloads.assert_called_once()
-
-
-def test_delete_workload():
-    """
-    Test the delete workload method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ret = ankaios.delete_workload("nginx")
-        assert isinstance(ret, UpdateStateSuccess)
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
 
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_workload("nginx")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.delete_workload("nginx")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_workload("nginx")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_update_configs():
-    """
-    Test the update configs method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ankaios.update_configs({"name": "config"})
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.update_configs({"name": "config"})
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.update_configs({"name": "config"})
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.update_configs({"name": "config"})
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_add_config():
-    """
-    Test the add config method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ankaios.add_config("name", "config")
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.add_config("name", "config")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.add_config("name", "config")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.add_config("name", "config")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_get_configs():
-    """
-    Test the get configs method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_configs") \
-            as mock_state_get_configs:
-        mock_get_state.return_value = CompleteState()
-        ankaios.get_configs()
-        mock_get_state.assert_called_once_with(
-            Ankaios.DEFAULT_TIMEOUT, field_masks=['desiredState.configs']
-            )
-        mock_state_get_configs.assert_called_once()
-
-
-def test_get_config():
-    """
-    Test the get config method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_configs") \
-            as mock_state_get_configs:
-        mock_get_state.return_value = CompleteState()
-        ankaios.get_config("config_name")
-        mock_get_state.assert_called_once_with(
-            Ankaios.DEFAULT_TIMEOUT,
-            field_masks=['desiredState.configs.config_name']
-            )
-        mock_state_get_configs.assert_called_once()
-
-
-def test_delete_all_configs():
-    """
-    Test the delete all configs method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ankaios.delete_all_configs()
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_all_configs()
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.delete_all_configs()
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_all_configs()
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-
-def test_delete_config():
-    """
-    Test the delete config method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        ankaios.delete_config("config_name")
-        mock_send_request.assert_called_once()
-        ankaios.logger.info.assert_called()
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_config("config_name")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.delete_config("config_name")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        with pytest.raises(AnkaiosException):
-            ankaios.delete_config("config_name")
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        mock_get_state (MagicMock): The get_state mock fixture.
+    """
+    mock_get_workloads = mock_get_state.return_value.get_workloads
+    mock_get_workloads.return_value = [WORKLOAD]
+    ret = ankaios.get_workload(WORKLOAD.name)
+    assert ret == WORKLOAD
+    mock_get_state.assert_called_once_with(
+        Ankaios.DEFAULT_TIMEOUT,
+        [f"{WORKLOADS_PREFIX}.nginx"]
+    )
+    mock_get_workloads.assert_called_once()
 
 
-def test_get_state():
+@pytest.mark.parametrize(
+    "response, side_effect, expected_exception, expected_log", [
+        (RESPONSE_COMPLETE_STATE, None, None, None),
+        (RESPONSE_ERROR, None, AnkaiosException, "error"),
+        (None, TimeoutError, TimeoutError, "error"),
+        (RESPONSE_UPDATE_SUCCESS, None, AnkaiosException, None),
+    ], ids=["success", "error", "timeout", "invalid_content_type"])
+def test_get_state(
+        ankaios: Ankaios, response: Response, side_effect: type,
+        expected_exception: type, expected_log: str
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the get state method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-
-    # Test success
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_COMPLETE_STATE)
-        ret = ankaios.get_state()
-        mock_send_request.assert_called_once()
-        assert isinstance(ret, CompleteState)
-
-    # Test error
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = Response(MESSAGE_BUFFER_ERROR)
-        with pytest.raises(AnkaiosException):
-            ankaios.get_state(field_masks=["invalid_mask"])
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.side_effect = TimeoutError()
-        with pytest.raises(TimeoutError):
-            ankaios.get_state()
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
-    # Test invalid content type
-    with patch("ankaios_sdk.Ankaios._send_request") as mock_send_request:
-        mock_send_request.return_value = \
-            Response(MESSAGE_BUFFER_UPDATE_SUCCESS)
-        with pytest.raises(AnkaiosException):
-            ankaios.get_state()
-        mock_send_request.assert_called_once()
-        ankaios.logger.error.assert_called()
-
 
-def test_get_agents():
-    """
-    Test the get agents method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_agents") \
-            as mock_state_get_agents:
-        mock_get_state.return_value = CompleteState()
-        ankaios.get_agents()
-        mock_get_state.assert_called_once_with(Ankaios.DEFAULT_TIMEOUT)
-        mock_state_get_agents.assert_called_once()
-
-
-def test_get_workload_states():
-    """
-    Test the get workload states method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workload_states") \
-            as mock_state_get_workload_states:
-        mock_get_state.return_value = CompleteState()
-        ankaios.get_workload_states()
-        mock_get_state.assert_called_once_with(Ankaios.DEFAULT_TIMEOUT)
-        mock_state_get_workload_states.assert_called_once()
-
-
-def test_get_execution_state_for_instance_name():
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        response (Response): The response returned by _send_request.
+        side_effect (type): The exception raised by _send_request.
+        expected_exception (type): The exception get_state should raise,
+            None if it should succeed.
+        expected_log (str): The logger method expected to be called,
+            None if nothing should be logged.
+    """
+    field_masks = [f"{WORKLOADS_PREFIX}.nginx"]
+    with patched_send_request(response, side_effect) as mock_send_request:
+        if expected_exception is None:
+            assert isinstance(ankaios.get_state(field_masks=field_masks),
+                              CompleteState)
+        else:
+            with pytest.raises(expected_exception):
+                ankaios.get_state(field_masks=field_masks)
+        mock_send_request.assert_called_once()
+    if expected_log is not None:
+        getattr(ankaios.logger, expected_log).assert_called_once()
+
+
+@pytest.mark.parametrize("method, args, state_getter, expected_call", [
+    ("get_agents", (), "get_agents",
+        call(Ankaios.DEFAULT_TIMEOUT)),
+    ("get_workload_states", (), "get_workload_states",
+        call(Ankaios.DEFAULT_TIMEOUT)),
+    ("get_workload_states_on_agent", ("agent_A",), "get_workload_states",
+        call(Ankaios.DEFAULT_TIMEOUT, ["workloadStates.agent_A"])),
+    ("get_configs", (), "get_configs",
+        call(Ankaios.DEFAULT_TIMEOUT, field_masks=["desiredState.configs"])),
+    ("get_config", ("config_name",), "get_configs",
+        call(Ankaios.DEFAULT_TIMEOUT,
+             field_masks=["desiredState.configs.config_name"])),
+])
+def test_state_getters(  # pylint: disable=too-many-arguments
+        ankaios: Ankaios,  # pylint: disable=redefined-outer-name
+        mock_get_state: MagicMock,  # pylint: disable=redefined-outer-name
+        method: str, args: tuple, state_getter: str, expected_call
+        ):  # pylint: disable=too-many-positional-arguments
+    """
+    Test the Ankaios methods that forward to a getter of the complete state.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        mock_get_state (MagicMock): The get_state mock fixture.
+        method (str): The name of the Ankaios method to call.
+        args (tuple): The arguments to pass to the method.
+        state_getter (str): The CompleteState getter expected to be called.
+        expected_call (call): The expected call of the get_state method.
+    """
+    getattr(ankaios, method)(*args)
+    assert mock_get_state.call_args_list == [expected_call]
+    getattr(mock_get_state.return_value, state_getter).assert_called_once()
+
+
+def test_get_execution_state_for_instance_name(
+        ankaios: Ankaios, mock_get_state: MagicMock
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the get execution state for instance name method of the Ankaios class.
+
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        mock_get_state (MagicMock): The get_state mock fixture.
     """
-    ankaios = generate_test_ankaios()
-    ankaios.logger = MagicMock()
-    workload_instance_name = WorkloadInstanceName(
-        agent_name="agent_Test",
-        workload_name="workload_Test",
-        workload_id="1234"
-    )
+    mock_get_as_list = mock_get_state.return_value \
+        .get_workload_states.return_value.get_as_list
 
     # State does not contain the required workload state
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workload_states") \
-            as mock_state_get_workload_states:
-        mock_get_state.return_value = CompleteState()
-        with pytest.raises(AnkaiosException):
-            ankaios.get_execution_state_for_instance_name(
-                workload_instance_name)
-        mock_state_get_workload_states.assert_called_once()
-        ankaios.logger.error.assert_called()
+    mock_get_as_list.return_value = []
+    with pytest.raises(AnkaiosException):
+        ankaios.get_execution_state_for_instance_name(INSTANCE_NAME)
+    mock_get_as_list.assert_called_once()
+    ankaios.logger.error.assert_called()
 
     # State contains the required workload state
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workload_states") \
-            as mock_state_get_workload_states, \
-            patch("ankaios_sdk.WorkloadStateCollection.get_as_list") \
-            as mock_state_get_as_list:
-        mock_get_state.return_value = CompleteState()
-        mock_state_get_workload_states.return_value = WorkloadStateCollection()
-        workload_state = MagicMock()
-        workload_state.execution_state = MagicMock()
-        mock_state_get_as_list.return_value = [workload_state]
-        assert ankaios.get_execution_state_for_instance_name(
-            workload_instance_name
-            ) == workload_state.execution_state
-
-
-def test_get_workload_states_on_agent():
-    """
-    Test the get workload states on agent method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workload_states") \
-            as mock_state_get_workload_states:
-        mock_get_state.return_value = CompleteState()
-        ankaios.get_workload_states_on_agent("agent_A")
-        mock_get_state.assert_called_once_with(
-            Ankaios.DEFAULT_TIMEOUT, ["workloadStates.agent_A"]
-        )
-        mock_state_get_workload_states.assert_called_once()
+    workload_state = MagicMock()
+    mock_get_as_list.return_value = [workload_state]
+    assert ankaios.get_execution_state_for_instance_name(
+        INSTANCE_NAME) == workload_state.execution_state
 
 
-def test_get_workload_states_for_name():
+def test_get_workload_states_for_name(
+        ankaios: Ankaios, mock_get_state: MagicMock
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the get workload states for workload name method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
 
-    with patch("ankaios_sdk.Ankaios.get_state") as mock_get_state, \
-            patch("ankaios_sdk.CompleteState.get_workload_states") \
-            as mock_state_get_workload_states:
-        mock_get_state.return_value = CompleteState()
-        wl_state_collection = WorkloadStateCollection()
-        wl_state = generate_test_workload_state()
-        wl_state_collection.add_workload_state(wl_state)
-        mock_state_get_workload_states.return_value = wl_state_collection
-        ret = ankaios.get_workload_states_for_name("workload_Test")
-        assert isinstance(ret, WorkloadStateCollection)
-        wl_list = ret.get_as_list()
-        assert len(wl_list) == 1
-        assert str(wl_list[0]) == str(wl_state)
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+        mock_get_state (MagicMock): The get_state mock fixture.
+    """
+    wl_state_collection = WorkloadStateCollection()
+    wl_state = generate_test_workload_state()
+    wl_state_collection.add_workload_state(wl_state)
+    mock_get_state.return_value.get_workload_states.return_value = \
+        wl_state_collection
+    ret = ankaios.get_workload_states_for_name("workload_Test")
+    assert isinstance(ret, WorkloadStateCollection)
+    wl_list = ret.get_as_list()
+    assert len(wl_list) == 1
+    assert str(wl_list[0]) == str(wl_state)
 
 
-def test_wait_for_workload_to_reach_state():
+def test_wait_for_workload_to_reach_state(
+        ankaios: Ankaios
+        ):  # pylint: disable=redefined-outer-name
     """
     Test the wait for workload to reach state method of the Ankaios class.
-    """
-    ankaios = generate_test_ankaios()
-    instance_name = WorkloadInstanceName(
-        agent_name="agent_Test",
-        workload_name="workload_Test",
-        workload_id="1234"
-    )
-
-    # Test timeout
-    with patch("ankaios_sdk.Ankaios.get_execution_state_for_instance_name") \
-            as mock_get_state:
-        mock_get_state.return_value = MagicMock()
-        mock_get_state().state = WorkloadStateEnum.FAILED
-        with pytest.raises(TimeoutError):
-            ankaios.wait_for_workload_to_reach_state(
-                instance_name, WorkloadStateEnum.RUNNING,
-                timeout=0.01
-            )
-        mock_get_state.assert_called()
 
-    # Test success
+    Args:
+        ankaios (Ankaios): The Ankaios fixture.
+    """
     with patch("ankaios_sdk.Ankaios.get_execution_state_for_instance_name") \
             as mock_get_state:
-        mock_get_state.return_value = MagicMock()
-        mock_get_state().state = WorkloadStateEnum.RUNNING
+        # Test timeout
+        # Only the state of the execution state is read
+        mock_get_state.return_value = SimpleNamespace(
+            state=WorkloadStateEnum.FAILED
+        )
+        with patch("ankaios_sdk.ankaios.time") as mock_time:
+            # The first poll leaves less than a poll interval before the
+            # deadline and the second one is already past it
+            mock_time.monotonic.side_effect = [0.0, 0.45, 1.0]
+            with pytest.raises(TimeoutError):
+                ankaios.wait_for_workload_to_reach_state(
+                    INSTANCE_NAME, WorkloadStateEnum.RUNNING,
+                    timeout=0.5
+                )
+            assert mock_get_state.call_count == 2
+            mock_time.sleep.assert_called_once_with(pytest.approx(0.05))
+
+        # Test success
+        mock_get_state.reset_mock()
+        mock_get_state.return_value = SimpleNamespace(
+            state=WorkloadStateEnum.RUNNING
+        )
         ankaios.wait_for_workload_to_reach_state(
-            instance_name, WorkloadStateEnum.RUNNING
+            INSTANCE_NAME, WorkloadStateEnum.RUNNING
         )
-        mock_get_state.assert_called()
+        mock_get_state.assert_called_once()
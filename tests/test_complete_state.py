@@ -72,6 +72,97 @@ COMPLETE_PROTO = proto_msg = _ank_base.CompleteState(
 )
 
 
+COMPLETE_STATE_DICT = {
+    'desired_state': {
+        'api_version': 'v0.1',
+        'workloads': {
+            'dynamic_nginx': {
+                'agent': 'agent_A',
+                'runtime': 'podman',
+                'runtimeConfig': 'image: control_interface_prod:0.1\\n',
+                'dependencies': {
+                    'nginx': 'ADD_COND_RUNNING'
+                },
+                'restartPolicy': 'ALWAYS',
+                'tags': [
+                    {
+                        'key': 'owner',
+                        'value': 'Ankaios team'
+                    }
+                ],
+                'controlInterfaceAccess': {
+                    'allowRules': [
+                        {
+                            'type': 'StateRule',
+                            'operation': 'Write',
+                            'filterMask': [
+                                'desiredState.workloads.dynamic_nginx'
+                            ]
+                        }
+                    ],
+                    'denyRules': [
+                        {
+                            'type': 'StateRule',
+                            'operation': 'Read',
+                            'filterMask': [
+                                'desiredState.workloads.dynamic_nginx'
+                            ]
+                        }]
+                },
+                'configs': {
+                    'array': 'config_2',
+                    'dict': 'config_3',
+                    'str': 'config_1'
+                }
+            }
+        },
+        'configs': {
+            'config_1': 'val_1',
+            'config_2': [
+                'val_2', 'val_3'
+            ],
+            'config_3': {
+                'key_1': 'val_4',
+                'key_2': 'val_5'
+            }
+        }
+    },
+    'workload_states': {
+        'agent_B': {
+            'nginx': {
+                '5678': {
+                    'state': 'PENDING',
+                    'substate': 'PENDING_WAITING_TO_START',
+                    'additional_info': 'Random info'
+                }
+            },
+            'dyn_nginx': {
+                '9012': {
+                    'state': 'STOPPING',
+                    'substate': 'STOPPING_WAITING_TO_STOP',
+                    'additional_info': 'Random info'
+                }
+            }
+        },
+        'agent_A': {
+            'nginx': {
+                '1234': {
+                    'state': 'SUCCEEDED',
+                    'substate': 'SUCCEEDED_OK',
+                    'additional_info': 'Random info'
+                }
+            }
+        }
+    },
+    'agents': {
+        'agent_A': {
+            'cpu_usage': 50,
+            'free_memory': 1024
+        }
+    }
+}
+
+
 def test_general_functionality():
     """
     Test general functionality of the CompleteState class.
@@ -183,95 +274,7 @@ def test_to_dict():
     complete_state._from_proto(COMPLETE_PROTO)
 
     complete_state_dict = complete_state.to_dict()
-    assert complete_state_dict == {
-        'desired_state': {
-            'api_version': 'v0.1',
-            'workloads': {
-                'dynamic_nginx': {
-                    'agent': 'agent_A',
-                    'runtime': 'podman',
-                    'runtimeConfig': 'image: control_interface_prod:0.1\\n',
-                    'dependencies': {
-                        'nginx': 'ADD_COND_RUNNING'
-                    },
-                    'restartPolicy': 'ALWAYS',
-                    'tags': [
-                        {
-                            'key': 'owner',
-                            'value': 'Ankaios team'
-                        }
-                    ],
-                    'controlInterfaceAccess': {
-                        'allowRules': [
-                            {
-                                'type': 'StateRule',
-                                'operation': 'Write',
-                                'filterMask': [
-                                    'desiredState.workloads.dynamic_nginx'
-                                ]
-                            }
-                        ],
-                        'denyRules': [
-                            {
-                                'type': 'StateRule',
-                                'operation': 'Read',
-                                'filterMask': [
-                                    'desiredState.workloads.dynamic_nginx'
-                                ]
-                            }]
-                    },
-                    'configs': {
-                        'array': 'config_2',
-                        'dict': 'config_3',
-                        'str': 'config_1'
-                    }
-                }
-            },
-            'configs': {
-                'config_1': 'val_1',
-                'config_2': [
-                    'val_2', 'val_3'
-                ],
-                'config_3': {
-                    'key_1': 'val_4',
-                    'key_2': 'val_5'
-                }
-            }
-        },
-        'workload_states': {
-            'agent_B': {
-                'nginx': {
-                    '5678': {
-                        'state': 'PENDING',
-                        'substate': 'PENDING_WAITING_TO_START',
-                        'additional_info': 'Random info'
-                    }
-                },
-                'dyn_nginx': {
-                    '9012': {
-                        'state': 'STOPPING',
-                        'substate': 'STOPPING_WAITING_TO_STOP',
-                        'additional_info': 'Random info'
-                    }
-                }
-            },
-            'agent_A': {
-                'nginx': {
-                    '1234': {
-                        'state': 'SUCCEEDED',
-                        'substate': 'SUCCEEDED_OK',
-                        'additional_info': 'Random info'
-                    }
-                }
-            }
-        },
-        'agents': {
-            'agent_A': {
-                'cpu_usage': 50,
-                'free_memory': 1024
-            }
-        }
-    }
+    assert complete_state_dict == COMPLETE_STATE_DICT
 
     # Test that it can be converted to json
     json.dumps(complete_state_dict)
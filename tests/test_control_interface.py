@@ -15,31 +15,99 @@
 """
 This module contains unit tests for the ControlInterface class
 in the ankaios_sdk.
+
+Helper Functions:
+    mocked_connect_env: Patches the fifos, the read thread and the
+        initial hello for a successful connect.
 """
 
+from contextlib import contextmanager
+from io import BufferedWriter, BytesIO
+import logging
+import re
 import threading
-import time
-from unittest.mock import patch, mock_open, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, mock_open, Mock
 import pytest
+from google.protobuf.internal.encoder import _VarintBytes
+from google.protobuf.internal.decoder import _DecodeVarint
 from ankaios_sdk import ControlInterface, ControlInterfaceState, \
     ControlInterfaceException
 from ankaios_sdk.utils import ANKAIOS_VERSION
 from ankaios_sdk._protos import _control_api
 from tests.test_request import generate_test_request
 from tests.response.test_response import MESSAGE_BUFFER_UPDATE_SUCCESS, \
-    MESSAGE_BUFFER_UPDATE_SUCCESS_LENGTH
+    MESSAGE_BUFFER_UPDATE_SUCCESS_LENGTH, MESSAGE_BUFFER_INVALID_RESPONSE, \
+    MESSAGE_BUFFER_CONNECTION_CLOSED
+
+
+INPUT_FIFO_PATH = "/run/ankaios/control_interface/input"
+OUTPUT_FIFO_PATH = "/run/ankaios/control_interface/output"
+
+# A length-prefixed message, as the agent writes it to the input fifo
+INPUT_FILE_CONTENT = MESSAGE_BUFFER_UPDATE_SUCCESS_LENGTH + \
+    MESSAGE_BUFFER_UPDATE_SUCCESS
+
+# A message long enough to need a two byte length prefix
+LARGE_PAYLOAD = b"x" * 200
+LARGE_MESSAGE = _VarintBytes(len(LARGE_PAYLOAD)) + LARGE_PAYLOAD
+
+# The hello message the control interface sends on (re)connect
+INITIAL_HELLO = _control_api.ToAnkaios(
+    hello=_control_api.Hello(
+        protocolVersion=str(ANKAIOS_VERSION)
+    )
+)
+
+ALREADY_CONNECTED_PATTERN = re.compile(re.escape("Already connected."))
+INPUT_FIFO_MISSING_PATTERN = re.compile("Control interface input fifo")
+OUTPUT_FIFO_MISSING_PATTERN = re.compile("Control interface output fifo")
+INPUT_FIFO_ERROR_PATTERN = re.compile("Error while opening input fifo")
+OUTPUT_FIFO_ERROR_PATTERN = re.compile("Error while opening output fifo")
+WRITE_ERROR_PATTERN = re.compile("Could not write to pipe")
+
+
+@contextmanager
+def mocked_connect_env():
+    """
+    Patch everything ControlInterface.connect touches, so that
+    connecting succeeds without real fifos or a real read thread.
+
+    Yields:
+        SimpleNamespace: The mocks, as exists, thread, open, hello,
+            thread_instance and output.
+    """
+    # Created before patching, so that the specs are the real classes
+    mock_thread_instance = Mock(spec=threading.Thread)
+    output_file_mock = Mock(spec=BufferedWriter)
+    with patch("os.path.exists") as mock_exists, \
+            patch("threading.Thread") as mock_thread, \
+            patch("builtins.open") as mock_open_file, \
+            patch("ankaios_sdk.ControlInterface._send_initial_hello") \
+            as mock_initial_hello:
+        mock_exists.return_value = True
+        mock_thread.return_value = mock_thread_instance
+        mock_open_file.return_value = output_file_mock
+        yield SimpleNamespace(
+            exists=mock_exists,
+            thread=mock_thread,
+            open=mock_open_file,
+            hello=mock_initial_hello,
+            thread_instance=mock_thread_instance,
+            output=output_file_mock
+        )
 
 
 def test_state():
     """
     Test the state enum and the changing of the state.
     """
-    state_changed = MagicMock()
+    state_changed = Mock()
     ci = ControlInterface(
         add_response_callback=lambda _: None,
         state_changed_callback=state_changed
     )
-    ci._logger = MagicMock()
+    ci._logger = Mock(spec=logging.Logger)
     assert ci._state == ControlInterfaceState.TERMINATED
     assert str(ci._state) == "TERMINATED"
 
@@ -64,169 +132,218 @@ def test_connection():
 
     # Already connected
     with pytest.raises(ControlInterfaceException,
-                       match="Already connected."):
+                       match=ALREADY_CONNECTED_PATTERN):
         ci.connect()
 
     # Test input pipe does not exist
     ci._state = ControlInterfaceState.TERMINATED
     with patch("os.path.exists") as mock_exists, \
         pytest.raises(ControlInterfaceException,
-                      match="Control interface input fifo"):
-        mock_exists.side_effect = lambda path: \
-            path != "/run/ankaios/control_interface/input"
+                      match=INPUT_FIFO_MISSING_PATTERN):
+        mock_exists.side_effect = {OUTPUT_FIFO_PATH}.__contains__
         ci.connect()
 
     # Test output pipe does not exist
     with patch("os.path.exists") as mock_exists, \
         pytest.raises(ControlInterfaceException,
-                      match="Control interface output fifo"):
-        mock_exists.side_effect = lambda path: \
-            path != "/run/ankaios/control_interface/output"
+                      match=OUTPUT_FIFO_MISSING_PATTERN):
+        mock_exists.side_effect = {INPUT_FIFO_PATH}.__contains__
         ci.connect()
 
     # Test output pipe error
     with patch("os.path.exists") as mock_exists, \
         patch("builtins.open") as mock_open_file, \
         pytest.raises(ControlInterfaceException,
-                      match="Error while opening output fifo"):
+                      match=OUTPUT_FIFO_ERROR_PATTERN):
         mock_exists.return_value = True
         mock_open_file.side_effect = OSError
         ci.connect()
 
     # Test success
-    with patch("os.path.exists") as mock_exists, \
-            patch("threading.Thread") as mock_thread, \
-            patch("builtins.open") as mock_open_file, \
-            patch("ankaios_sdk.ControlInterface._send_initial_hello") \
-            as mock_initial_hello:
-        mock_exists.return_value = True
-        mock_thread_instance = MagicMock()
-        mock_thread.return_value = mock_thread_instance
-        output_file_mock = MagicMock()
-        mock_open_file.return_value = output_file_mock
-
+    with mocked_connect_env() as mocks:
         # Build ankaios and connect
         ci.connect()
-        mock_thread.assert_called_once_with(
+        mocks.thread.assert_called_once_with(
             target=ci._read_from_control_interface,
             daemon=True
         )
-        mock_thread_instance.start.assert_called_once()
-        mock_open_file.assert_called_once_with(
-            "/run/ankaios/control_interface/output", "ab"
-        )
+        mocks.thread_instance.start.assert_called_once()
+        mocks.open.assert_called_once_with(OUTPUT_FIFO_PATH, "ab")
         assert ci._read_thread is not None
-        assert ci._output_file == output_file_mock
-        mock_initial_hello.assert_called_once()
+        assert ci._output_file == mocks.output
+        mocks.hello.assert_called_once()
         assert ci._state == ControlInterfaceState.INITIALIZED
         assert not ci._disconnect_event.is_set()
 
         # Disconnect
         ci.disconnect()
-
         assert ci._disconnect_event.is_set()
         assert ci._state == ControlInterfaceState.TERMINATED
-        mock_thread_instance.join.assert_called_once()
+        mocks.thread_instance.join.assert_called_once()
         assert ci._read_thread is None
-        output_file_mock.close.assert_called_once()
+        mocks.output.close.assert_called_once()
         assert ci._output_file is None
         assert ci._input_file is None
 
     # Test disconnect while not connected
-    ci._logger = MagicMock()
+    ci._logger = Mock(spec=logging.Logger)
     assert ci._state == ControlInterfaceState.TERMINATED
     ci.disconnect()
     ci._logger.debug.assert_called_with("Already disconnected.")
 
 
-def test_read_from_control_interface():
+def test_read_messages():
     """
-    Test the _read_from_control_interface method of the Ankaios class.
+    Test the _read_messages method of the ControlInterface class.
+    """
+    ci = ControlInterface(
+        add_response_callback=lambda _: None,
+        state_changed_callback=lambda _: None
+    )
+    ci._input_file = Mock()
+    ci._input_file.read.side_effect = [
+        # Only the first byte of the two byte length prefix
+        LARGE_MESSAGE[:1],
+        # The length prefix and part of the payload
+        LARGE_MESSAGE[1:150],
+        # The rest of the payload followed by another message
+        LARGE_MESSAGE[150:] + INPUT_FILE_CONTENT,
+        # Nothing to read
+        b""
+    ]
+
+    assert ci._read_messages() == []
+    assert ci._read_messages() == []
+    assert ci._read_messages() == [LARGE_PAYLOAD,
+                                   MESSAGE_BUFFER_UPDATE_SUCCESS]
+    assert ci._read_messages() is None
+    ci._input_file.read.assert_called_with(ci.READ_CHUNK_SIZE)
+    assert not ci._read_buffer
+
+
+def test_read_messages_partial_before_eof():
+    """
+    Test that a partial message is dropped when the fifo returns EOF,
+    so that the data of a reconnected agent is framed correctly.
+    """
+    ci = ControlInterface(
+        add_response_callback=lambda _: None,
+        state_changed_callback=lambda _: None
+    )
+    ci._input_file = Mock()
+    ci._input_file.read.side_effect = [
+        # The agent goes away in the middle of a message
+        INPUT_FILE_CONTENT[:5],
+        b"",
+        # The reconnected agent sends a complete message
+        INPUT_FILE_CONTENT
+    ]
+
+    assert ci._read_messages() == []
+    assert ci._read_messages() is None
+    assert not ci._read_buffer
+    assert ci._read_messages() == [MESSAGE_BUFFER_UPDATE_SUCCESS]
+    assert not ci._read_buffer
+
+
+def test_read_from_control_interface_open_error():
+    """
+    Test that an error while opening the input fifo disconnects.
     """
-    input_file_content = MESSAGE_BUFFER_UPDATE_SUCCESS_LENGTH + \
-        MESSAGE_BUFFER_UPDATE_SUCCESS
-    response_callback = MagicMock()
-
-    # Test error while opening input pipe
     with patch("builtins.open", side_effect=OSError), \
          patch("ankaios_sdk.ControlInterface.disconnect") as mock_disconnect:
         ci = ControlInterface(
-            add_response_callback=response_callback,
+            add_response_callback=lambda _: None,
             state_changed_callback=lambda _: None
         )
         with pytest.raises(ControlInterfaceException,
-                           match="Error while opening input fifo"):
+                           match=INPUT_FIFO_ERROR_PATTERN):
             ci._read_from_control_interface()
         mock_disconnect.assert_called_once()
 
-    # Test success
+
+@pytest.mark.parametrize(
+    "messages, expected_responses, expected_errors, expected_state", [
+        ([MESSAGE_BUFFER_UPDATE_SUCCESS], 1, 0,
+         ControlInterfaceState.AGENT_DISCONNECTED),
+        ([MESSAGE_BUFFER_INVALID_RESPONSE, MESSAGE_BUFFER_UPDATE_SUCCESS],
+         1, 1, ControlInterfaceState.AGENT_DISCONNECTED),
+        ([MESSAGE_BUFFER_CONNECTION_CLOSED, MESSAGE_BUFFER_UPDATE_SUCCESS],
+         0, 1, ControlInterfaceState.CONNECTION_CLOSED),
+        ([], 0, 0, ControlInterfaceState.AGENT_DISCONNECTED),
+    ], ids=["success", "invalid_response", "connection_closed",
+            "agent_disconnected"])
+def test_read_from_control_interface(
+        messages: list, expected_responses: int, expected_errors: int,
+        expected_state: ControlInterfaceState
+        ):
+    """
+    Test the _read_from_control_interface method of the ControlInterface
+    class. The reading loop is driven synchronously, it stops when the
+    fifo runs dry and the agent gone routine disconnects.
+
+    Args:
+        messages (list): The messages the agent writes to the input fifo.
+        expected_responses (int): The number of responses handed on.
+        expected_errors (int): The number of errors logged.
+        expected_state (ControlInterfaceState): A state the control
+            interface is expected to pass through.
+    """
+    content = b"".join(_VarintBytes(len(msg)) + msg for msg in messages)
     with patch("builtins.open", mock_open()) as mock_file, \
             patch("os.set_blocking") as _, \
-            patch("select.select") as mock_select:
+            patch("select.select") as mock_select, \
+            patch("ankaios_sdk.ControlInterface._agent_gone_routine") \
+            as mock_agent_gone:
         mock_select.return_value = ([True], [], [])
         mock_file_handle = mock_file.return_value.__enter__.return_value
-        mock_file_handle.read.side_effect = \
-            [bytes([b]) for b in input_file_content]
+        # Behave like a real file, returning up to the requested size
+        mock_file_handle.read.side_effect = BytesIO(content).read
 
+        response_callback = Mock()
+        state_changed_callback = Mock()
         ci = ControlInterface(
             add_response_callback=response_callback,
-            state_changed_callback=lambda _: None
-        )
-
-        # Start thread (similar to _connect)
-        ci._read_thread = threading.Thread(
-            target=ci._read_from_control_interface,
-            daemon=True
+            state_changed_callback=state_changed_callback
         )
+        ci._logger = Mock(spec=logging.Logger)
+        mock_agent_gone.side_effect = ci._disconnect_event.set
         ci._state = ControlInterfaceState.INITIALIZED
-        ci._read_thread.start()
-        time.sleep(0.01)
+        ci._read_from_control_interface()
 
-        # Stop thread (similar to disconnect)
-        ci._state = ControlInterfaceState.TERMINATED
-        ci._disconnect_event.set()
-        ci._read_thread.join()
+    mock_file.assert_called_once_with(INPUT_FIFO_PATH, "rb", buffering=0)
+    assert response_callback.call_count == expected_responses
+    for call_args in response_callback.call_args_list:
+        assert call_args.args[0].get_request_id() == "1234"
+    assert ci._logger.error.call_count == expected_errors
+    state_changed_callback.assert_any_call(expected_state)
+    assert ci.state == ControlInterfaceState.TERMINATED
 
-        mock_file.assert_called_once_with(
-            "/run/ankaios/control_interface/input", "rb")
-        response_callback.assert_called_once()
 
-    # Test agent disconnected case
+def test_read_error_from_control_interface():
+    """
+    Test that an error while reading the input fifo stops the reading
+    and cleans up.
+    """
     with patch("builtins.open", mock_open()) as mock_file, \
             patch("os.set_blocking") as _, \
-            patch("select.select") as mock_select, \
-            patch("ankaios_sdk.ControlInterface._agent_gone_routine") \
-            as mock_agent_gone:
-
-        # Data is available, but read returns empty
+            patch("select.select") as mock_select:
         mock_select.return_value = ([True], [], [])
         mock_file_handle = mock_file.return_value.__enter__.return_value
-        mock_file_handle.read.return_value = b""
+        mock_file_handle.read.side_effect = OSError("Read failed")
 
         ci = ControlInterface(
             add_response_callback=lambda _: None,
             state_changed_callback=lambda _: None
         )
-
-        # Start thread (similar to _connect)
-        ci._read_thread = threading.Thread(
-            target=ci._read_from_control_interface,
-            daemon=True
-        )
+        ci._logger = Mock(spec=logging.Logger)
         ci._state = ControlInterfaceState.INITIALIZED
-        ci._read_thread.start()
-        time.sleep(0.01)
-
-        assert ci.state == ControlInterfaceState.AGENT_DISCONNECTED
 
-        # Stop thread (similar to disconnect)
-        ci._state = ControlInterfaceState.TERMINATED
-        ci._disconnect_event.set()
-        ci._read_thread.join()
-
-        mock_file.assert_called_once_with(
-            "/run/ankaios/control_interface/input", "rb")
-        mock_agent_gone.assert_called()
+        # The reading stops by itself, so no thread is needed
+        ci._read_from_control_interface()
+        ci._logger.error.assert_called_once()
+        mock_file_handle.close.assert_called_once()
+        assert ci.state == ControlInterfaceState.TERMINATED
 
 
 def test_agent_gone_routine():
@@ -244,28 +361,38 @@ def test_agent_gone_routine():
         mock_initial_hello.assert_not_called()
 
     ci._state = ControlInterfaceState.AGENT_DISCONNECTED
-    original_sleep = time.sleep
-    with patch("time.sleep",
-               new=lambda x: original_sleep(x)
-               if x != 1 else original_sleep(0.01)
-               ) as _, \
-        patch("ankaios_sdk.ControlInterface._send_initial_hello") \
+    with patch.object(ci._disconnect_event, "wait", return_value=False) \
+            as mock_wait, \
+            patch("ankaios_sdk.ControlInterface._send_initial_hello") \
             as mock_initial_hello:
+        # The agent is gone for the first attempt and back for the second
+        mock_initial_hello.side_effect = [BrokenPipeError, None]
+
+        ci._agent_gone_routine()
+
+        assert mock_initial_hello.call_count == 2
+        mock_wait.assert_called_once_with(1)
+        assert ci._state == ControlInterfaceState.INITIALIZED
 
+    # Disconnecting while waiting for the agent stops the retries
+    ci._state = ControlInterfaceState.AGENT_DISCONNECTED
+    ci._disconnect_event.set()
+    with patch("ankaios_sdk.ControlInterface._send_initial_hello") \
+            as mock_initial_hello:
         mock_initial_hello.side_effect = BrokenPipeError
 
-        agent_gone_thread = threading.Thread(
-            target=ci._agent_gone_routine,
-            daemon=True
-        )
-        agent_gone_thread.start()
-        time.sleep(0.01)
-        mock_initial_hello.side_effect = None
-        time.sleep(0.01)
-        agent_gone_thread.join()
+        ci._agent_gone_routine()
 
-        mock_initial_hello.assert_called()
-        assert ci._state == ControlInterfaceState.INITIALIZED
+        mock_initial_hello.assert_called_once()
+        assert ci._state == ControlInterfaceState.AGENT_DISCONNECTED
+
+    # The waiting reading thread is stopped on disconnect
+    ci._disconnect_event.clear()
+    ci._read_thread = Mock(spec=threading.Thread)
+    ci._read_thread.is_alive.return_value = False
+    ci.disconnect()
+    assert ci._disconnect_event.is_set()
+    assert ci._state == ControlInterfaceState.TERMINATED
 
 
 def test_write_to_pipe():
@@ -279,15 +406,20 @@ def test_write_to_pipe():
 
     ci._output_file = None
     with pytest.raises(ControlInterfaceException,
-                       match="Could not write to pipe"):
+                       match=WRITE_ERROR_PATTERN):
         ci._write_to_pipe(_control_api.FromAnkaios())
 
-    output_file = MagicMock()
+    output_file = Mock(spec=BufferedWriter)
     ci._output_file = output_file
 
-    ci._write_to_pipe(_control_api.FromAnkaios())
+    to_ankaios = _control_api.ToAnkaios(
+        request=generate_test_request()._to_proto()
+    )
+    ci._write_to_pipe(to_ankaios)
 
-    output_file.write.assert_called()
+    # Length prefix and message go out in a single write
+    msg = to_ankaios.SerializeToString()
+    output_file.write.assert_called_once_with(_VarintBytes(len(msg)) + msg)
     output_file.flush.assert_called_once()
 
 
@@ -302,7 +434,7 @@ def test_write_request():
 
     ci._state = ControlInterfaceState.TERMINATED
     with pytest.raises(ControlInterfaceException,
-                       match="Could not write to pipe"):
+                       match=WRITE_ERROR_PATTERN):
         ci.write_request(generate_test_request())
 
     ci._state = ControlInterfaceState.INITIALIZED
@@ -319,11 +451,14 @@ def test_send_initial_hello():
         add_response_callback=lambda _: None,
         state_changed_callback=lambda _: None
         )
-    with patch("ankaios_sdk.ControlInterface._write_to_pipe") as mock_write:
-        initial_hello = _control_api.ToAnkaios(
-            hello=_control_api.Hello(
-                protocolVersion=str(ANKAIOS_VERSION)
-            )
-        )
-        ci._send_initial_hello()
-        mock_write.assert_called_once_with(initial_hello)
+    output_file = Mock(spec=BufferedWriter)
+    ci._output_file = output_file
+
+    ci._send_initial_hello()
+
+    # The cached bytes decode to the expected hello message
+    written = output_file.write.call_args.args[0]
+    msg_len, pos = _DecodeVarint(written, 0)
+    assert len(written) == pos + msg_len
+    assert _control_api.ToAnkaios.FromString(written[pos:]) == INITIAL_HELLO
+    output_file.flush.assert_called_once()
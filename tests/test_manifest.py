@@ -16,10 +16,13 @@
 This module contains unit tests for the Manifest class in the ankaios_sdk.
 """
 
-from unittest.mock import patch, mock_open
+from io import StringIO
+from unittest.mock import patch
 import pytest
+import yaml
 from ankaios_sdk import Manifest, InvalidManifestException
 from ankaios_sdk.utils import WORKLOADS_PREFIX, CONFIGS_PREFIX
+from ankaios_sdk._components.manifest import _YamlLoader
 
 
 MANIFEST_CONTENT = """apiVersion: v0.1
@@ -56,33 +59,60 @@ MANIFEST_DICT = {
     }
 }
 
+# Variants of MANIFEST_DICT, built without touching the original
+MANIFEST_DICT_TWO_WORKLOADS = {
+    **MANIFEST_DICT,
+    'workloads': {
+        **MANIFEST_DICT['workloads'],
+        'nginx_test_other': {
+            'runtime': 'podman',
+            'restartPolicy': 'NEVER',
+            'agent': 'agent_B',
+            'runtimeConfig': 'image: image/test'
+        }
+    }
+}
+
+MANIFEST_DICT_ONLY_CONFIGS = {
+    key: value for key, value in MANIFEST_DICT.items() if key != 'workloads'
+}
+
 
 def test_from_file():
     """
     Test the from_file method of the Manifest class,
     ensuring it correctly loads a manifest from a file and handles errors.
     """
-    with patch("builtins.open", mock_open(read_data=MANIFEST_CONTENT)), \
+    with patch("builtins.open", return_value=StringIO(MANIFEST_CONTENT)) \
+            as mock_open_file, \
             patch("ankaios_sdk.Manifest.from_string") as mock_from_string:
         _ = Manifest.from_file("manifest.yaml")
+        mock_open_file.assert_called_once_with("manifest.yaml", "r",
+                                               encoding="utf-8")
         mock_from_string.assert_called_once_with(MANIFEST_CONTENT)
 
     with pytest.raises(ValueError, match="Error reading manifest file"):
         _ = Manifest.from_file("invalid_path")
 
 
-def test_from_string():
+@pytest.mark.parametrize("loader", [yaml.SafeLoader, _YamlLoader],
+                         ids=["python", "default"])
+def test_from_string(loader: type):
     """
     Test the from_string method of the Manifest class,
     ensuring it correctly parses a manifest from a YAML
     string and handles errors.
+
+    Args:
+        loader (type): The YAML loader the manifest is parsed with.
     """
-    with patch("ankaios_sdk.Manifest.from_dict") as mock_from_dict:
-        _ = Manifest.from_string(MANIFEST_CONTENT)
-        mock_from_dict.assert_called_once_with(MANIFEST_DICT)
+    with patch("ankaios_sdk._components.manifest._YamlLoader", loader):
+        with patch("ankaios_sdk.Manifest.from_dict") as mock_from_dict:
+            _ = Manifest.from_string(MANIFEST_CONTENT)
+            mock_from_dict.assert_called_once_with(MANIFEST_DICT)
 
-    with pytest.raises(ValueError, match="Error parsing manifest"):
-        _ = Manifest.from_string("invalid_manifest")
+        with pytest.raises(ValueError, match="Error parsing manifest"):
+            _ = Manifest.from_string("invalid_manifest")
 
 
 def test_from_dict():
@@ -127,14 +157,7 @@ def test_calculate_masks():
     Test the calculated masks for the manifest data,
     ensuring they are correctly generated based on the workload names.
     """
-    manifest_dict = MANIFEST_DICT.copy()
-    manifest_dict["workloads"]["nginx_test_other"] = {
-            'runtime': 'podman',
-            'restartPolicy': 'NEVER',
-            'agent': 'agent_B',
-            'runtimeConfig': 'image: image/test'
-        }
-    manifest = Manifest(manifest_dict)
+    manifest = Manifest(MANIFEST_DICT_TWO_WORKLOADS)
     assert len(manifest._calculate_masks()) == 3
     assert manifest._calculate_masks() == [
         f"{WORKLOADS_PREFIX}.nginx_test",
@@ -147,8 +170,6 @@ def test_manifest_only_configs():
     """
     Test the manifest with only configs.
     """
-    manifest_dict = MANIFEST_DICT.copy()
-    manifest_dict.pop("workloads")
-    manifest = Manifest(manifest_dict)
+    manifest = Manifest(MANIFEST_DICT_ONLY_CONFIGS)
     assert len(manifest._calculate_masks()) == 1
     assert manifest._calculate_masks() == [f"{CONFIGS_PREFIX}.test_ports"]
@@ -278,6 +278,7 @@ def test_to_proto(workload: Workload):  # pylint: disable=redefined-outer-name
         _ank_base.Tag(key="key1", value="value1"),
         _ank_base.Tag(key="key2", value="value2")
     ])
+    assert str(workload) == str(proto)
 
 
 def test_proto():
@@ -295,7 +296,7 @@ def test_from_to_dict():
 
     workload_other = Workload._from_dict(
         workload_new.name, workload_new.to_dict())
-    assert str(workload_new) == str(workload_other)
+    assert workload_new._to_proto() == workload_other._to_proto()
 
 
 @pytest.mark.parametrize("function_name, data, mask", [